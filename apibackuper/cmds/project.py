@@ -2,13 +2,14 @@
 import configparser
 import json
 import logging
+import logging.handlers
 import os
 import csv
 import time
 from timeit import default_timer as timer
 from zipfile import ZipFile, ZIP_DEFLATED
 import gzip
-from urllib.parse import urlparse
+from urllib.parse import urlparse, urlencode, quote
 import requests
 from pathlib import Path
 from contextlib import suppress
@@ -19,6 +20,11 @@ import xmltodict
 with suppress(ImportError):
     import aria2p
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from ..common import get_dict_value, set_dict_value, update_dict_values
 from ..constants import (
     DEFAULT_DELAY,
@@ -29,27 +35,51 @@ from ..constants import (
     FILE_SIZE_DOWNLOAD_LIMIT,
     DEFAULT_ERROR_STATUS_CODES,
     RETRY_DELAY,
-    DEFAULT_NUMBER_OF_PAGES
+    DEFAULT_NUMBER_OF_PAGES,
+    FILE_READ_BUFFER_SIZE,
+    CSV_READ_BUFFER_SIZE,
+    EXPORT_BATCH_SIZE,
+    LOG_BUFFER_CAPACITY,
+    DEFAULT_COMPRESS_LEVEL,
+    DEFAULT_LOG_FILE,
+    LOG_FILE_ENV,
+    MSG_CONFIG_NOT_FOUND,
+    MSG_ONLY_ZIP_STORAGE
 )
 from ..storage import FilesystemStorage, ZipFileStorage
 
 
 def load_file_list(filename, encoding="utf8"):
-    """Reads file and returns list of strings as list"""
-    flist = []
-    with open(filename, "r", encoding=encoding) as fobj:
+    """Reads file and returns list of strings as list. Whole file decoded at once.
+    Lines split on \\n or \\r\\n only, trailing whitespace stripped"""
+    with open(filename, "rb") as fobj:
+        lines = fobj.read().decode(encoding).split("\n")
+    if not lines[-1]:
+        lines.pop()
+    return [line.rstrip() for line in lines]
+
+
+def iter_file_list(filename, encoding="utf8"):
+    """Reads file and yields its lines one by one, trailing whitespace stripped.
+    Lines split on \\n or \\r\\n only"""
+    with open(filename, "r", encoding=encoding, newline="\n",
+              buffering=FILE_READ_BUFFER_SIZE) as fobj:
         for line in fobj:
-            flist.append(line.rstrip())
-    return flist
+            yield line.rstrip()
+
+
+def iter_csv_data(filename, encoding="utf8", delimiter=";"):
+    """Reads CSV file and yields records as dicts"""
+    with open(filename, "r", encoding=encoding, newline="",
+              buffering=CSV_READ_BUFFER_SIZE) as fobj:
+        yield from csv.DictReader(fobj, delimiter=delimiter)
 
 
 def load_csv_data(filename, key, encoding="utf8", delimiter=";"):
-    """Reads CSV file and returns list records as array of dicts"""
+    """Reads CSV file and returns dict of records (dicts) by key"""
     flist = {}
-    with open(filename, "r", encoding=encoding) as fobj:
-        reader = csv.DictReader(fobj, delimiter=delimiter)
-        for row in reader:
-            flist[row[key]] = row
+    for row in iter_csv_data(filename, encoding=encoding, delimiter=delimiter):
+        flist[row[key]] = row
     return flist
 
 
@@ -61,11 +91,37 @@ def _url_replacer(url, params, query_mode=False):
     else:
         splitter = PARAM_SPLITTER
         query_char = PARAM_SPLITTER
-    parsed = urlparse(url)
-    finalparams = []
-    for key, value in params.items():
-        finalparams.append("%s=%s" % (str(key), str(value)))
-    return parsed.geturl() + query_char + splitter.join(finalparams)
+    return url + query_char + splitter.join(
+        f"{key}={value}" for key, value in params.items())
+
+
+def _flat_query(params):
+    """Builds query string from flat params with JSON-like string values"""
+    return urlencode([(key, value.replace("'", '"').replace("True", "true"))
+                      for key, value in params.items()],
+                     quote_via=quote)
+
+
+def _dumps_line(item):
+    """Serializes item as compact JSON line bytes. Uses orjson if installed.
+
+    Output of both serializers is the same except for non-finite floats:
+    orjson writes NaN and Infinity as null, json writes them as is.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(item) + b"\n"
+        except orjson.JSONEncodeError:
+            pass
+    return (json.dumps(item, ensure_ascii=False, separators=(",", ":")) +
+            "\n").encode("utf8")
+
+
+# Export format name to function opening output file in binary mode
+EXPORT_OPENERS = {
+    "jsonl": lambda filename: open(filename, "wb"),
+    "gzip": lambda filename: gzip.open(filename, mode="wb"),
+}
 
 
 def load_json_file(filename, default={}):
@@ -79,17 +135,34 @@ def load_json_file(filename, default={}):
     return data
 
 
+class _FrozenMemoryHandler(logging.handlers.MemoryHandler):
+    """Memory handler formatting record message before buffering it,
+    so mutable args are logged as they were at logging call"""
+
+    def emit(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        super().emit(record)
+
+
 class ProjectBuilder:
     """Project builder"""
 
-    def __init__(self, project_path=None):
-        self.http = requests.Session()
+    def __init__(self, project_path=None, http_session=None):
+        self._http = http_session
         self.project_path = os.getcwd() if project_path is None else project_path
         self.config_filename = os.path.join(self.project_path,
                                             "apibackuper.cfg")
         self.__read_config(self.config_filename)
         self.enable_logging()
 
+    @property
+    def http(self):
+        """HTTP session, created on first use unless passed to constructor"""
+        if self._http is None:
+            self._http = requests.Session()
+        return self._http
+
     def enable_logging(self):
         """Enable logging to file and StdErr"""
         logFormatter = logging.Formatter(
@@ -97,9 +170,15 @@ class ProjectBuilder:
         )
         rootLogger = logging.getLogger()
 
-        fileHandler = logging.FileHandler("{0}".format(self.logfile))
+        # Log file opened on first record, path may be overridden by env var
+        logfile = os.environ.get(LOG_FILE_ENV) or getattr(
+            self, "logfile", DEFAULT_LOG_FILE)
+        fileHandler = logging.FileHandler(logfile, delay=True)
         fileHandler.setFormatter(logFormatter)
-        rootLogger.addHandler(fileHandler)
+        # Log records written to file in batches, errors flushed immediately
+        memoryHandler = _FrozenMemoryHandler(
+            LOG_BUFFER_CAPACITY, flushLevel=logging.ERROR, target=fileHandler)
+        rootLogger.addHandler(memoryHandler)
 
         consoleHandler = logging.StreamHandler()
         consoleHandler.setFormatter(logFormatter)
@@ -111,140 +190,78 @@ class ProjectBuilder:
             conf = configparser.ConfigParser()
             conf.read(filename, encoding="utf8")
             self.config = conf
-            storagedir = (conf.get(
-                "storage", "storage_path") if conf.has_option(
-                    "storage", "storage_path") else "storage")
+            storagedir = conf.get("storage", "storage_path", fallback="storage")
             self.storagedir = os.path.join(self.project_path, storagedir)
-            self.field_splitter = (conf.get(
-                "settings", "splitter") if conf.has_option(
-                    "settings", "splitter") else FIELD_SPLITTER)
-            self.id = (conf.get("settings", "id") if conf.has_option(
-                "settings", "id") else None)
+            self.field_splitter = conf.get("settings", "splitter", fallback=FIELD_SPLITTER)
+            self.id = conf.get("settings", "id", fallback=None)
             self.name = conf.get("settings", "name")
-            self.logfile = (conf.get("settings", "logfile") if conf.has_option(
-                "settings", "logfile") else "apibackuper.log")
-            self.data_key = conf.get("data", "data_key") if conf.has_option('data', 'data_key') else None
+            self.logfile = conf.get("settings", "logfile", fallback=DEFAULT_LOG_FILE)
+            self.data_key = conf.get("data", "data_key", fallback=None)
             self.storage_type = conf.get("storage", "storage_type")
+            self.compresslevel = conf.getint("storage",
+                                             "storage_compresslevel",
+                                             fallback=DEFAULT_COMPRESS_LEVEL)
             self.http_mode = conf.get("project", "http_mode")
-            self.description = (conf.get(
-                "project", "description") if conf.has_option(
-                    "project", "description") else None)
+            self.description = conf.get("project", "description", fallback=None)
             self.start_url = conf.get("project", "url")
             self.page_limit = conf.getint("params", "page_size_limit")
-            self.resp_type = (conf.get("project",
-                                       "resp_type") if conf.has_option(
-                                           "project", "resp_type") else "json")
-            self.iterate_by = (conf.get(
-                "project", "iterate_by") if conf.has_option(
-                    "project", "iterate_by") else "page")
-            self.default_delay = (conf.getint(
-                "project", "default_delay") if conf.has_option(
-                    "project", "default_delay") else DEFAULT_DELAY)
-            self.retry_delay = (conf.getint(
-                "project", "retry_delay") if conf.has_option(
-                    "project", "retry_delay") else RETRY_DELAY)
-            self.force_retry = (conf.getboolean(
-                "project", "force_retry") if conf.has_option(
-                    "project", "force_retry") else False)
-            self.retry_count = (conf.getint(
-                "project", "retry_count") if conf.has_option(
-                    "project", "retry_count") else DEFAULT_RETRY_COUNT)
-
-            self.start_page = (conf.getint("params", "start_page") if
-                               conf.has_option("params", "start_page") else 1)
-            self.query_mode = (conf.get(
-                "params", "query_mode") if conf.has_option(
-                    "params", "query_mode") else "query")
-            self.flat_params = (conf.getboolean(
-                "params", "force_flat_params") if conf.has_option(
-                    "params", "force_flat_params") else False)
-            self.total_number_key = (conf.get("data", "total_number_key")
-                                     if conf.has_option(
-                                         "data", "total_number_key") else "")
-            self.pages_number_key = (conf.get("data", "pages_number_key")
-                                     if conf.has_option(
-                                         "data", "pages_number_key") else "")
-            self.page_number_param = (conf.get(
-                "params", "page_number_param") if conf.has_option(
-                    "params", "page_number_param") else None)
-            self.count_skip_param = (conf.get(
-                "params", "count_skip_param") if conf.has_option(
-                    "params", "count_skip_param") else None)
-            self.count_from_param = (conf.get(
-                "params", "count_from_param") if conf.has_option(
-                    "params", "count_from_param") else None)
-            self.count_to_param = (conf.get(
-                "params", "count_to_param") if conf.has_option(
-                    "params", "count_to_param") else None)
-            self.page_size_param = (conf.get(
-                "params", "page_size_param") if conf.has_option(
-                    "params", "page_size_param") else None)
+            self.resp_type = conf.get("project", "resp_type", fallback="json")
+            self.iterate_by = conf.get("project", "iterate_by", fallback="page")
+            self.default_delay = conf.getint("project", "default_delay", fallback=DEFAULT_DELAY)
+            self.retry_delay = conf.getint("project", "retry_delay", fallback=RETRY_DELAY)
+            self.force_retry = conf.getboolean("project", "force_retry", fallback=False)
+            self.retry_count = conf.getint("project", "retry_count", fallback=DEFAULT_RETRY_COUNT)
+
+            self.start_page = conf.getint("params", "start_page", fallback=1)
+            self.query_mode = conf.get("params", "query_mode", fallback="query")
+            self.flat_params = conf.getboolean("params", "force_flat_params", fallback=False)
+            self.total_number_key = conf.get("data", "total_number_key", fallback="")
+            self.pages_number_key = conf.get("data", "pages_number_key", fallback="")
+            self.page_number_param = conf.get("params", "page_number_param", fallback=None)
+            self.count_skip_param = conf.get("params", "count_skip_param", fallback=None)
+            self.count_from_param = conf.get("params", "count_from_param", fallback=None)
+            self.count_to_param = conf.get("params", "count_to_param", fallback=None)
+            self.page_size_param = conf.get("params", "page_size_param", fallback=None)
             self.storage_file = os.path.join(self.storagedir, "storage.zip")
             self.details_storage_file = os.path.join(self.storagedir,
                                                      "details.zip")
 
-            self.code_postfetch = conf.get('code', 'postfetch') if conf.has_option('code', 'postfetch') else None
-            self.code_follow = conf.get('code', 'follow') if conf.has_option('code', 'follow') else None
+            self.code_postfetch = conf.get("code", "postfetch", fallback=None)
+            self.code_follow = conf.get("code", "follow", fallback=None)
 
             self.follow_enabled = False
             if conf.has_section("follow"):
                 self.follow_enabled = True
-                self.follow_data_key = (conf.get(
-                    "follow", "follow_data_key") if conf.has_option(
-                        "follow", "follow_data_key") else None)
-                self.follow_item_key = (conf.get(
-                    "follow", "follow_item_key") if conf.has_option(
-                        "follow", "follow_item_key") else None)
-                self.follow_mode = (conf.get(
-                    "follow", "follow_mode") if conf.has_option(
-                        "follow", "follow_mode") else None)
-                self.follow_http_mode = (conf.get(
-                    "follow", "follow_http_mode") if conf.has_option(
-                        "follow", "follow_http_mode") else "GET")
-                self.follow_param = (conf.get("follow", "follow_param")
-                                     if conf.has_option(
-                                         "follow", "follow_param") else None)
-                self.follow_pattern = (conf.get(
-                    "follow", "follow_pattern") if conf.has_option(
-                        "follow", "follow_pattern") else None)
-                self.follow_url_key = (conf.get(
-                    "follow", "follow_url_key") if conf.has_option(
-                        "follow", "follow_url_key") else None)
+                self.follow_data_key = conf.get("follow", "follow_data_key", fallback=None)
+                self.follow_item_key = conf.get("follow", "follow_item_key", fallback=None)
+                self.follow_mode = conf.get("follow", "follow_mode", fallback=None)
+                self.follow_http_mode = conf.get("follow", "follow_http_mode", fallback="GET")
+                self.follow_param = conf.get("follow", "follow_param", fallback=None)
+                self.follow_pattern = conf.get("follow", "follow_pattern", fallback=None)
+                self.follow_url_key = conf.get("follow", "follow_url_key", fallback=None)
             if conf.has_section("files"):
                 self.fetch_mode = conf.get("files", "fetch_mode")
-                self.default_ext = (conf.get(
-                    "files", "default_ext") if conf.has_option(
-                        "files", "default_ext") else None)
+                self.default_ext = conf.get("files", "default_ext", fallback=None)
                 self.files_keys = conf.get("files", "keys").split(",")
                 self.root_url = conf.get("files", "root_url")
-                self.storage_mode = (conf.get(
-                    "files", "storage_mode") if conf.has_option(
-                        "files", "storage_mode") else "filepath")
-                self.file_storage_type = (conf.get(
-                    "files", "file_storage_type") if conf.has_option(
-                        "files", "file_storage_type") else "zip")
-                self.use_aria2 = (conf.get(
-                    "files", "use_aria2") if conf.has_option(
-                        "files", "use_aria2") else "False")
+                self.storage_mode = conf.get("files", "storage_mode", fallback="filepath")
+                self.file_storage_type = conf.get("files", "file_storage_type", fallback="zip")
+                self.use_aria2 = conf.get("files", "use_aria2", fallback="False")
 
     def _single_request(self, url, headers, params, flatten=None):
         """Single http/https request"""
         if self.http_mode == "GET":
             if self.flat_params and len(params.keys()) > 0:
-                s = []
-                for key, value in flatten.items():
-                    s.append("%s=%s" %
-                             (key, value.replace("'", '"').replace("True", "true")))
-                logging.info("url: %s" % (url + "?" + "&".join(s)))
+                full_url = url + "?" + _flat_query(flatten)
+                logging.info("url: %s", full_url)
                 if headers:
-                    response = self.http.get(url + "?" + "&".join(s),
+                    response = self.http.get(full_url,
                                              headers=headers,
                                              verify=False)
                 else:
-                    response = self.http.get(url + "?" + "&".join(s),
-                                             verify=False)
+                    response = self.http.get(full_url, verify=False)
             else:
-                logging.info("url: %s, params: %s" % (url, str(params)))
+                logging.info("url: %s, params: %s", url, params)
                 if headers:
                     response = self.http.get(url,
                                              params=params,
@@ -253,8 +270,8 @@ class ProjectBuilder:
                 else:
                     response = self.http.get(url, params=params, verify=False)
         else:
-            logging.debug("Request %s, params %s, headers %s" %
-                          (url, str(params), str(headers)))
+            logging.debug("Request %s, params %s, headers %s", url, params,
+                          headers)
             if headers:
                 response = self.http.post(url,
                                           json=params,
@@ -296,27 +313,33 @@ class ProjectBuilder:
         """[TBD] Unfinished method. Don't use it please"""
         self.__read_config(self.config_filename)
         if self.config is None:
-            print("Config file not found. Please run in project directory")
+            print(MSG_CONFIG_NOT_FOUND)
             return
 
     def export(self, format, filename):
         """Exports data as JSON lines, BSON and other formats"""
         if self.config is None:
-            print("Config file not found. Please run in project directory")
+            print(MSG_CONFIG_NOT_FOUND)
             return
-        if format == "jsonl":
-            outfile = open(filename, "w", encoding="utf8")
-        elif format == "gzip":
-            outfile = gzip.open(filename, mode="wt", encoding="utf8")
-        else:
+        opener = EXPORT_OPENERS.get(format)
+        if opener is None:
             print("Only 'jsonl' format supported for now.")
             return
+        outfile = opener(filename)
+        buf = bytearray()
+
+        def write_line(item):
+            buf.extend(_dumps_line(item))
+            if len(buf) >= EXPORT_BATCH_SIZE:
+                outfile.write(buf)
+                buf.clear()
+
         details_file = os.path.join(self.storagedir, "details.zip")
         if self.config.has_section("follow") and os.path.exists(details_file):
             mzip = ZipFile(details_file, mode="r", compression=ZIP_DEFLATED)
             for fname in mzip.namelist():
                 tf = mzip.open(fname, "r")
-                logging.info("Loading %s" % (fname))
+                logging.info("Loading %s", fname)
                 data = json.load(tf)
                 tf.close()
                 try:
@@ -326,19 +349,14 @@ class ProjectBuilder:
                             self.follow_data_key,
                             splitter=self.field_splitter)
                         if isinstance(follow_data, dict):
-                            outfile.write(
-                                json.dumps(follow_data, ensure_ascii=False) +
-                                "\n")
+                            write_line(follow_data)
                         else:
                             for item in follow_data:
-                                outfile.write(
-                                    json.dumps(item, ensure_ascii=False) +
-                                    "\n")
+                                write_line(item)
                     else:
-                        outfile.write(
-                            json.dumps(data, ensure_ascii=False) + "\n")
+                        write_line(data)
                 except KeyError:
-                    logging.info("Data key: %s not found" % (self.data_key))
+                    logging.info("Data key: %s not found", self.data_key)
         else:
             storage_file = os.path.join(self.storagedir, "storage.zip")
             if not os.path.exists(storage_file):
@@ -358,21 +376,21 @@ class ProjectBuilder:
                         for item in get_dict_value(
                                 data, self.data_key,
                                 splitter=self.field_splitter):
-                            outfile.write(
-                                json.dumps(item, ensure_ascii=False) + "\n")
+                            write_line(item)
                     else:
                         for item in data:
-                            outfile.write(
-                                json.dumps(item, ensure_ascii=False) + "\n")
+                            write_line(item)
                 except KeyError:
-                    logging.info("Data key: %s not found" % (self.data_key))
+                    logging.info("Data key: %s not found", self.data_key)
+        if buf:
+            outfile.write(buf)
         outfile.close()
-        logging.info("Data exported to %s" % (filename))
+        logging.info("Data exported to %s", filename)
 
     def run(self, mode):
         """Run data collection"""
         if self.config is None:
-            print("Config file not found. Please run in project directory")
+            print(MSG_CONFIG_NOT_FOUND)
             return
         if not os.path.exists(self.storagedir):
             os.mkdir(self.storagedir)
@@ -383,13 +401,19 @@ class ProjectBuilder:
             process_func = script['process']
 
         if self.storage_type != "zip":
-            print("Only zip storage supported right now")
+            print(MSG_ONLY_ZIP_STORAGE)
             return
         storage_file = os.path.join(self.storagedir, "storage.zip")
         if mode == "full":
-            mzip = ZipFile(storage_file, mode="w", compression=ZIP_DEFLATED)
+            mzip = ZipFile(storage_file,
+                           mode="w",
+                           compression=ZIP_DEFLATED,
+                           compresslevel=self.compresslevel)
         else:
-            mzip = ZipFile(storage_file, mode="a", compression=ZIP_DEFLATED)
+            mzip = ZipFile(storage_file,
+                           mode="a",
+                           compression=ZIP_DEFLATED,
+                           compresslevel=self.compresslevel)
 
         start = timer()
         headers = load_json_file(os.path.join(self.project_path,
@@ -443,7 +467,7 @@ class ProjectBuilder:
             num_pages = None
             total = None
         if total is not None and num_pages is not None:
-             logging.info("Total pages %d, records %d" % (num_pages, total))
+             logging.info("Total pages %d, records %d", num_pages, total)
              num_pages = int(num_pages)
         else: 
              num_pages = DEFAULT_NUMBER_OF_PAGES
@@ -466,7 +490,7 @@ class ProjectBuilder:
                     else:
                         start_page = page
                     break
-            logging.debug("Start page number %d" % (start_page))
+            logging.debug("Start page number %d", start_page)
         for page in range(start_page, end_page):
             if self.page_size_param and len(self.page_size_param) > 0:
                 change_params[self.page_size_param] = self.page_limit
@@ -502,21 +526,21 @@ class ProjectBuilder:
             if response.status_code in DEFAULT_ERROR_STATUS_CODES:
                 rc = 0
                 for rc in range(1, self.retry_count, 1):
-                    logging.info("Retry attempt %d of %d, delay %d" %
-                                 (rc, self.retry_count, self.retry_delay))
+                    logging.info("Retry attempt %d of %d, delay %d", rc,
+                                 self.retry_count, self.retry_delay)
                     time.sleep(self.retry_delay)
                     response = self._single_request(url, headers, params,
                                                     flatten)
                     if response.status_code not in DEFAULT_ERROR_STATUS_CODES:
                         logging.info(
-                            "Looks like finally we have proper response on %d attempt"
-                            % (rc))
+                            "Looks like finally we have proper response on %d attempt",
+                            rc)
                         break
             if response.status_code not in DEFAULT_ERROR_STATUS_CODES:
                 if num_pages is not None:
-                    logging.info("Saving page %d of %d" % (page, num_pages))
+                    logging.info("Saving page %d of %d", page, num_pages)
                 else:
-                    logging.info("Saving page %d" % (page))
+                    logging.info("Saving page %d", page)
                 if self.resp_type == "json":
                     outdata = response.content
                 elif self.resp_type == "xml":
@@ -524,15 +548,17 @@ class ProjectBuilder:
                 elif self.resp_type == "html":
                     outdata = json.dumps(process_func(response.content), ensure_ascii=False)
                 if len(outdata) == 0:
-                    logging.info("Empty results on page %d. Stopped" % (page))
+                    logging.info("Empty results on page %d. Stopped", page)
                     break             
                 mzip.writestr("page_%d.json" % (page), outdata)
                 if self.page_limit:                    
                     if len(outdata) < int(self.page_limit):
-                        logging.info("Page %d size is %d, less than expected page size %s. Stopped" % (page, len(outdata), str(self.page_limit)))
+                        logging.info(
+                            "Page %d size is %d, less than expected page size %s. Stopped",
+                            page, len(outdata), self.page_limit)
                         break             
             else:
-                logging.info("Errors persist on page %d. Stopped" % (page))
+                logging.info("Errors persist on page %d. Stopped", page)
                 break
         mzip.close()
 
@@ -542,7 +568,7 @@ class ProjectBuilder:
         """Collects data about each data using additional requests"""
  
         if self.config is None:
-            print("Config file not found. Please run in project directory")
+            print(MSG_CONFIG_NOT_FOUND)
             return
         if not self.follow_enabled:
             print("Follow mode not enabled")
@@ -550,7 +576,7 @@ class ProjectBuilder:
         if not os.path.exists(self.storagedir):
             os.mkdir(self.storagedir)
         if self.storage_type != "zip":
-            print("Only zip storage supported right now")
+            print(MSG_ONLY_ZIP_STORAGE)
             return
 
         if not os.path.exists(self.storage_file):
@@ -600,24 +626,26 @@ class ProjectBuilder:
                         allkeys.append(item[self.follow_item_key])
                 #                except KeyError:
                 except KeyboardInterrupt:
-                    logging.info("Data key: %s not found" % (self.data_key))
-            logging.info("%d allkeys to process" % (len(allkeys)))
+                    logging.info("Data key: %s not found", self.data_key)
+            logging.info("%d allkeys to process", len(allkeys))
             if mode == "full":
                 mzip = ZipFile(self.details_storage_file,
                                mode="w",
-                               compression=ZIP_DEFLATED)
+                               compression=ZIP_DEFLATED,
+                               compresslevel=self.compresslevel)
                 finallist = allkeys
             elif mode == "continue":
                 mzip = ZipFile(self.details_storage_file,
                                mode="a",
-                               compression=ZIP_DEFLATED)
+                               compression=ZIP_DEFLATED,
+                               compresslevel=self.compresslevel)
                 keys = []
                 filenames = mzip.namelist()
                 for name in filenames:
                     keys.append(int(name.rsplit(".", 1)[0]))
-                logging.info("%d filenames in zip file" % (len(keys)))
+                logging.info("%d filenames in zip file", len(keys))
                 finallist = list(set(allkeys) - set(keys))
-            logging.info("%d keys in final list" % (len(finallist)))
+            logging.info("%d keys in final list", len(finallist))
 
             n = 0
             total = len(finallist)
@@ -642,8 +670,7 @@ class ProjectBuilder:
                     else:
                         response = self.http.post(self.follow_pattern,
                                                   params=params, verify=False)
-                logging.info("Saving object with id %s. %d of %d" %
-                             (key, n, total))                
+                logging.info("Saving object with id %s. %d of %d", key, n, total)
                 if self.resp_type == 'json':
                     mzip.writestr('%s.json' % (key), response.content)
                 elif self.resp_type == 'html':
@@ -668,17 +695,19 @@ class ProjectBuilder:
                             self.follow_url_key,
                             splitter=self.field_splitter)
                 except KeyError:
-                    logging.info("Data key: %s not found" % (self.data_key))
+                    logging.info("Data key: %s not found", self.data_key)
             if mode == "full":
                 mzip = ZipFile(self.details_storage_file,
                                mode="w",
-                               compression=ZIP_DEFLATED)
+                               compression=ZIP_DEFLATED,
+                               compresslevel=self.compresslevel)
                 finallist = allkeys
                 n = 0
             elif mode == "continue":
                 mzip = ZipFile(self.details_storage_file,
                                mode="a",
-                               compression=ZIP_DEFLATED)
+                               compression=ZIP_DEFLATED,
+                               compresslevel=self.compresslevel)
                 keys = []
                 filenames = mzip.namelist()
                 for name in filenames:
@@ -698,8 +727,7 @@ class ProjectBuilder:
                 #                else:
                 #                if http_mode == 'GET':
                 #                    response = self.http.post(start_url, json=params)
-                logging.info("Saving object with id %s. %d of %d" %
-                             (key, n, total))
+                logging.info("Saving object with id %s. %d of %d", key, n, total)
                 if self.resp_type == 'json':
                     mzip.writestr('%s.json' % (key), response.content)
                 elif self.resp_type == 'html':
@@ -724,16 +752,18 @@ class ProjectBuilder:
                     for item in repeatable_data:
                         allkeys.append(item[self.follow_item_key])
                 except KeyboardInterrupt:
-                    logging.info("Data key: %s not found" % (self.data_key))
+                    logging.info("Data key: %s not found", self.data_key)
             if mode == "full":
                 mzip = ZipFile(self.details_storage_file,
                                mode="w",
-                               compression=ZIP_DEFLATED)
+                               compression=ZIP_DEFLATED,
+                               compresslevel=self.compresslevel)
                 finallist = allkeys
             elif mode == "continue":
                 mzip = ZipFile(self.details_storage_file,
                                mode="a",
-                               compression=ZIP_DEFLATED)
+                               compression=ZIP_DEFLATED,
+                               compresslevel=self.compresslevel)
                 keys = []
                 filenames = mzip.namelist()
                 for name in filenames:
@@ -747,8 +777,7 @@ class ProjectBuilder:
                 url = self.follow_pattern + str(key)
                 #                print(url)
                 response = self.http.get(url, verify=False)
-                logging.info("Saving object with id %s. %d of %d" %
-                             (key, n, total))
+                logging.info("Saving object with id %s. %d of %d", key, n, total)
                 if self.resp_type == 'json':
                     mzip.writestr('%s.json' % (key), response.content)
                 elif self.resp_type == 'html':
@@ -761,12 +790,12 @@ class ProjectBuilder:
     def getfiles(self, be_careful=False):
         """Downloads all files associated with this API data"""
         if self.config is None:
-            print("Config file not found. Please run in project directory")
+            print(MSG_CONFIG_NOT_FOUND)
             return
         if not os.path.exists(self.storagedir):
             os.mkdir(self.storagedir)
         if self.storage_type != "zip":
-            print("Only zip storage supported right now")
+            print(MSG_ONLY_ZIP_STORAGE)
             return
         storage_file = os.path.join(self.storagedir, "storage.zip")
         if not os.path.exists(storage_file):
@@ -790,8 +819,7 @@ class ProjectBuilder:
                 for fname in mzip.namelist():
                     n += 1
                     if n % 10 == 0:
-                        logging.info("Processed %d files, uniq ids %d" %
-                                     (n, len(uniq_ids)))
+                        logging.info("Processed %d files, uniq ids %d", n, len(uniq_ids))
                     tf = mzip.open(fname, "r")
                     data = json.load(tf)
                     tf.close()
@@ -821,8 +849,7 @@ class ProjectBuilder:
                                                 else:
                                                     uniq_ids.add(uniq_id)
                     except KeyError:
-                        logging.info("Data key: %s not found" %
-                                     (str(self.data_key)))
+                        logging.info("Data key: %s not found", self.data_key)
             else:
                 details_storage_file = os.path.join(self.storagedir,
                                                     "details.zip")
@@ -833,7 +860,7 @@ class ProjectBuilder:
                 for fname in mzip.namelist():
                     n += 1
                     if n % 1000 == 0:
-                        logging.info("Processed %d records" % (n))
+                        logging.info("Processed %d records", n)
                     tf = mzip.open(fname, "r")
                     data = json.load(tf)
                     tf.close()
@@ -868,7 +895,7 @@ class ProjectBuilder:
             f.close()
         else:
             logging.info("Load all filenames")
-            uniq_ids = load_file_list(allfiles_name)
+            uniq_ids = iter_file_list(allfiles_name)
         # Start download
         processed_files = []
         skipped_files_dict = {}
@@ -910,7 +937,8 @@ class ProjectBuilder:
         if self.file_storage_type == "zip":
             fstorage = ZipFileStorage(files_storage_file,
                                       mode="a",
-                                      compression=ZIP_DEFLATED)
+                                      compression=ZIP_DEFLATED,
+                                      compresslevel=self.compresslevel)
         elif self.file_storage_type == "filesystem":
             fstorage = FilesystemStorage(os.path.join("storage", "files"))
 
@@ -922,7 +950,7 @@ class ProjectBuilder:
                 url = self.root_url.format(uniq_id)
             n += 1
             if n % 50 == 0:
-                logging.info("Downloaded %d files" % (n))
+                logging.info("Downloaded %d files", n)
             #            if url in processed_files:
             #                continue
             if be_careful:
@@ -944,8 +972,8 @@ class ProjectBuilder:
                 if ("content-length" in r.headers.keys() and int(
                         r.headers["content-length"]) > FILE_SIZE_DOWNLOAD_LIMIT
                         and self.file_storage_type == "zip"):
-                    logging.info("File skipped with size %d and name %s" %
-                                 (int(r.headers["content-length"]), url))
+                    logging.info("File skipped with size %d and name %s",
+                                 int(r.headers["content-length"]), url)
                     record = {
                         "filename":
                         filename,
@@ -965,15 +993,18 @@ class ProjectBuilder:
                     filename = str(uniq_id)
             if self.storage_mode == "filepath":
                 filename = urlparse(url).path
-            logging.info("Processing %s as %s" % (url, filename))
+            logging.info("Processing %s as %s", url, filename)
             if fstorage.exists(filename):
-                logging.info("File %s already stored" % (filename))
+                logging.info("File %s already stored", filename)
                 continue
             if not use_aria2:
-                response = self.http.get(url, headers=headers,
-                                         timeout=DEFAULT_TIMEOUT,
-                                         verify=False)
-                fstorage.store(filename, response.content)
+                with self.http.get(url, headers=headers,
+                                   timeout=DEFAULT_TIMEOUT,
+                                   verify=False,
+                                   stream=True) as response:
+                    # Body copied to storage in chunks, not held in memory
+                    response.raw.decode_content = True
+                    fstorage.store_stream(filename, response.raw)
                 list_file.write(url + "\n")
             else:
                 aria2.add_uris(
@@ -994,7 +1025,7 @@ class ProjectBuilder:
     def estimate(self, mode):
         """Measures time, size and count of records"""
         if self.config is None:
-            print("Config file not found. Please run in project directory")
+            print(MSG_CONFIG_NOT_FOUND)
             return
         data = []
         params = {}
@@ -1043,20 +1074,16 @@ class ProjectBuilder:
                 url = self.start_url
             if self.http_mode == "GET":
                 if self.flat_params and len(params.keys()) > 0:
-                    s = []
-                    for k, v in params.items():
-                        s.append(
-                            "%s=%s" %
-                            (k, v.replace("'", '"').replace("True", "true")))
+                    full_url = url + "?" + _flat_query(params)
                     if headers:
                         start_page_data = self.http.get(
-                            url + "?" + "&".join(s), headers=headers, verify=False).json()
+                            full_url, headers=headers, verify=False).json()
                     else:
-                        start_page_data = self.http.get(url + "?" +
-                                                        "&".join(s), verify=False).json()
+                        start_page_data = self.http.get(full_url,
+                                                        verify=False).json()
                 else:
-                    logging.debug("Start request params: %s headers: %s" %
-                                  (str(params), str(headers)))
+                    logging.debug("Start request params: %s headers: %s",
+                                  params, headers)
                     if headers and len(headers.keys()) > 0:
                         if params and len(params.keys()) > 0:
                             response = self.http.get(url,
@@ -1129,13 +1156,13 @@ class ProjectBuilder:
     def info(self, stats=False):
         report = {}
         if self.config is None:
-            print("Config file not found. Please run in project directory")
+            print(MSG_CONFIG_NOT_FOUND)
             return None
         return report
 
     def to_package(self, filename=None):
         if self.config is None:
-            print("Config file not found. Please run in project directory")
+            print(MSG_CONFIG_NOT_FOUND)
             return
 
         #        if not filename:
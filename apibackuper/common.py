@@ -1,40 +1,80 @@
 # coding: utf-8
 """Common functions"""
-from collections import defaultdict
-import lxml.etree as etree
+import sys
+from functools import lru_cache
+
+__all__ = [
+    "etree_to_dict",
+    "get_dict_value",
+    "set_dict_value",
+    "update_dict_values",
+]
+
+
+@lru_cache(maxsize=4096)
+def _split_key(key, splitter="."):
+    """Splits key with splitter into tuple of interned key parts.
+    Cached, since same keys are resolved for every record"""
+    return tuple(sys.intern(part) for part in key.split(splitter))
 
 
 def etree_to_dict(t, prefix_strip=True):
-    """Converts XML (etree) object to the python dictionary. XML prefixes stripped"""
-    tag = t.tag if not prefix_strip else t.tag.rsplit("}", 1)[-1]
-    d = {tag: {} if t.attrib else None}
-    children = list(t)
-    if children:
-        dd = defaultdict(list)
-        for dc in map(etree_to_dict, children):
-            for k, v in dc.items():
-                if prefix_strip:
-                    k = k.rsplit("}", 1)[-1]
-                dd[k].append(v)
-        d = {tag: {k: v[0] if len(v) == 1 else v for k, v in dd.items()}}
-    if t.attrib:
-        d[tag].update(
-            ("@" + k.rsplit("}", 1)[-1], v) for k, v in t.attrib.items())
-    if t.text:
-        text = t.text.strip()
-        if children or t.attrib:
-            tag = tag.rsplit("}", 1)[-1]
-            if text:
-                d[tag]["#text"] = text
+    """Converts XML (etree) object to the python dictionary. XML prefixes stripped.
+    Tree walked with explicit stack, so deep documents don't hit recursion limit"""
+    tag_cache = {}
+    stack = [(t, iter(t), [])]
+    while stack:
+        elem, children, results = stack[-1]
+        for child in children:
+            stack.append((child, iter(child), []))
+            break
         else:
-            d[tag] = text
-    return d
+            stack.pop()
+            tag = tag_cache.get(elem.tag)
+            if tag is None:
+                tag = sys.intern(
+                    elem.tag.rpartition("}")[2] if prefix_strip else elem.tag)
+                tag_cache[elem.tag] = tag
+            d = {tag: {} if elem.attrib else None}
+            if results:
+                dd = {}
+                for dc in results:
+                    for k, v in dc.items():
+                        dd.setdefault(k, []).append(v)
+                d = {tag: {k: (v[0] if len(v) == 1 else v) for k, v in dd.items()}}
+            if elem.attrib:
+                d[tag].update(("@" + k.rpartition("}")[2], v)
+                              for k, v in elem.attrib.items())
+            if elem.text:
+                text = elem.text.strip()
+                if results or elem.attrib:
+                    if text:
+                        d[tag]["#text"] = text
+                else:
+                    d[tag] = text
+            if not stack:
+                return d
+            stack[-1][2].append(d)
 
 
 def get_dict_value(adict, key, prefix=None, as_array=False, splitter="."):
     """Used to get value from hierarhic dicts in python with params with dots as splitter"""
     if prefix is None:
-        prefix = key.split(splitter)
+        if not as_array and isinstance(adict, dict) and splitter not in key:
+            # Flat key, most common case
+            return adict.get(key)
+        prefix = _split_key(key, splitter)
+        if not as_array:
+            # Fast path for dicts-only data, lists handled below
+            value = adict
+            try:
+                for part in prefix:
+                    value = value[part]
+                return value
+            except KeyError:
+                return None
+            except (TypeError, IndexError):
+                pass
     if len(prefix) == 1:
         if type(adict) == type({}):
             if not prefix[0] in adict.keys():
@@ -82,41 +122,54 @@ def get_dict_value(adict, key, prefix=None, as_array=False, splitter="."):
 
 
 def set_dict_value(adict, key, value, prefix=None, splitter="."):
-    """Used to set value in hierarhic dicts in python with params with dots as splitter"""
+    """Used to set value in hierarhic dicts in python with params with dots as splitter.
+    Missing intermediate dicts are created, lists get value set in each of their dicts.
+    Existing non-container intermediate values are left unchanged"""
     if prefix is None:
-        prefix = key.split(splitter)
-    if len(prefix) == 1:
-        if type(adict) == type({}):
-            adict[prefix[0]] = value
+        prefix = _split_key(key, splitter)
+    nodes = [adict]
+    last = len(prefix) - 1
+    for n, part in enumerate(prefix):
+        dicts = []
+        for node in nodes:
+            if isinstance(node, dict):
+                dicts.append(node)
+            elif isinstance(node, list):
+                dicts.extend(v for v in node if isinstance(v, dict))
+        if n == last:
+            for node in dicts:
+                node[part] = value
+            break
+        nodes = []
+        for node in dicts:
+            if part not in node:
+                node[part] = {}
+            nodes.append(node[part])
+    return adict
+
+
+def _update_dict_group(adict, items):
+    """Sets values grouped by common key prefix, walking each prefix once"""
+    if not isinstance(adict, dict):
+        for prefix, value in items:
+            adict = set_dict_value(adict, None, value, prefix=prefix)
         return adict
-    else:
-        if type(adict) == type({}):
-            adict[prefix[0]] = set_dict_value(adict[prefix[0]],
-                                              key,
-                                              value,
-                                              prefix=prefix[1:])
-            return adict
-        elif type(adict) == type([]):
-            result = []
-            for v in adict:
-                res = set_dict_value(v[prefix[0]],
-                                     key,
-                                     value,
-                                     prefix=prefix[1:])
-                if res:
-                    result.extend(res)
-                return result
+    groups = {}
+    for prefix, value in items:
+        if len(prefix) == 1:
+            adict[prefix[0]] = value
         else:
-            adict[prefix[0]] = set_dict_value(adict[0][prefix[0]],
-                                                  key,
-                                                  value,
-                                                  prefix=prefix[1:])
-            return adict
-        return None
+            groups.setdefault(prefix[0], []).append((prefix[1:], value))
+    for k, subitems in groups.items():
+        if k not in adict:
+            adict[k] = {}
+        elif not isinstance(adict[k], (dict, list)):
+            continue
+        adict[k] = _update_dict_group(adict[k], subitems)
+    return adict
 
 
-def update_dict_values(left_dict, params_dict):
+def update_dict_values(left_dict, params_dict, splitter="."):
     """Used to update values of hierarhic dicts in python with params with dots as splitter"""
-    for k, v in params_dict.items():
-        left_dict = set_dict_value(left_dict, k, v)
-    return left_dict
+    return _update_dict_group(
+        left_dict, [(_split_key(k, splitter), v) for k, v in params_dict.items()])
@@ -11,4 +11,19 @@ PARAM_SPLITTER = ";"
 
 DEFAULT_ERROR_STATUS_CODES = [500, 502, 503]
 
-DEFAULT_NUMBER_OF_PAGES = 20000
\ No newline at end of file
+DEFAULT_NUMBER_OF_PAGES = 20000
+
+FILE_READ_BUFFER_SIZE = 1024 * 1024
+CSV_READ_BUFFER_SIZE = 128 * 1024
+EXPORT_BATCH_SIZE = 64 * 1024
+ZIP_BUFFER_SIZE = 1024 * 1024
+ZIP_STORED_MAX_SIZE = 256
+STREAM_CHUNK_SIZE = 1024 * 1024
+# zlib level 1 compresses JSON several times faster than default 6
+DEFAULT_COMPRESS_LEVEL = 1
+LOG_BUFFER_CAPACITY = 1000
+DEFAULT_LOG_FILE = "apibackuper.log"
+LOG_FILE_ENV = "APIBACKUPER_LOG"
+
+MSG_CONFIG_NOT_FOUND = "Config file not found. Please run in project directory"
+MSG_ONLY_ZIP_STORAGE = "Only zip storage supported right now"
@@ -2,32 +2,53 @@
 # -*- coding: utf8 -*-
 from pprint import pprint
 import logging
-import urllib3
 import click
 
-from .cmds.project import ProjectBuilder
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
-urllib3.disable_warnings()
+# Options shared by project commands
+projectpath_option = click.option("--projectpath",
+                                  "-p",
+                                  default=None,
+                                  help="Project path")
+verbose_option = click.option("--verbose",
+                              "-v",
+                              count=False,
+                              help="Verbose output. Print additional info")
 
-# logging.getLogger().addHandler(logging.StreamHandler())
-logging.basicConfig(
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    level=logging.DEBUG)
+
+_VERBOSE_ENABLED = False
 
 
 def enable_verbose():
-    logging.basicConfig(
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        level=logging.DEBUG,
-    )
+    """Enables debug level logging, repeated calls do nothing"""
+    global _VERBOSE_ENABLED
+    if _VERBOSE_ENABLED:
+        return
+    logging.getLogger().setLevel(logging.DEBUG)
+    _VERBOSE_ENABLED = True
+
+
+def _builder(projectpath, verbose=False):
+    """Returns project builder for project path, enables verbose output if requested"""
+    import urllib3
+    from .cmds.project import ProjectBuilder
+
+    urllib3.disable_warnings()
+    if verbose:
+        enable_verbose()
+    return ProjectBuilder(projectpath)
 
 
 @click.group()
-def cli1():
-    pass
+def cli():
+    """Command-line tool to archive/backup API calls"""
+    # Configured here, not at import, so --help skips logging setup
+    logging.basicConfig(format=LOG_FORMAT, level=logging.INFO)
 
 
-@cli1.command()
+# Not registered with cli until ProjectBuilder.init is implemented
+@click.command()
 @click.option("--config", "-c", default=None, help="Configuration file name")
 @click.option("--pagekey",
               "-k",
@@ -68,10 +89,7 @@ def cli1():
     help=
     "Download modes supported by this API, could be 'full', 'incremental' or 'update'. Multiple modes could be used",
 )
-@click.option("--verbose",
-              "-v",
-              count=False,
-              help="Verbose output. Print additional info")
+@verbose_option
 def init(
     url,
     pagekey,
@@ -85,9 +103,7 @@ def init(
     verbose,
 ):
     """Initializes project with required parameters"""
-    if verbose:
-        enable_verbose()
-    acmd = ProjectBuilder()
+    acmd = _builder(None, verbose)
     acmd.init(
         url,
         pagekey,
@@ -101,154 +117,81 @@ def init(
     )
 
 
-@click.group()
-def cli2():
-    pass
-
-
-@cli2.command()
+@cli.command()
 @click.argument("name")
 def create(name):
     """Creates new project"""
-    ProjectBuilder.create(name)
-    pass
+    from .cmds.project import ProjectBuilder
 
-
-@click.group()
-def cli3():
+    ProjectBuilder.create(name)
     pass
 
 
-@cli3.command()
+@cli.command()
 @click.argument("mode", default="full")
-@click.option("--projectpath", "-p", default=None, help="Project path")
-@click.option("--verbose",
-              "-v",
-              count=False,
-              help="Verbose output. Print additional info")
+@projectpath_option
+@verbose_option
 def run(mode, projectpath, verbose):
     """Executes project, collects data from API"""
-    if verbose:
-        enable_verbose()
-    if projectpath:
-        acmd = ProjectBuilder(projectpath)
-    else:
-        acmd = ProjectBuilder(projectpath)
+    acmd = _builder(projectpath, verbose)
     acmd.run(mode)
 
 
-@click.group()
-def cli4():
-    pass
-
-
-@cli4.command()
+@cli.command()
 @click.argument("mode", default="full")
-@click.option("--projectpath", "-p", default=None, help="Project path")
+@projectpath_option
 def estimate(mode, projectpath):
     """Estimate data size, records number and execution time"""
-    if projectpath:
-        acmd = ProjectBuilder(projectpath)
-    else:
-        acmd = ProjectBuilder(projectpath)
+    acmd = _builder(projectpath)
     acmd.estimate(mode)
 
 
-@click.group()
-def cli5():
-    pass
-
-
-@cli5.command()
+@cli.command()
 @click.argument("format", default="jsonl")
 @click.argument("filename", default=None)
-@click.option("--projectpath", "-p", default=None, help="Project path")
-@click.option("--verbose",
-              "-v",
-              count=False,
-              help="Verbose output. Print additional info")
+@projectpath_option
+@verbose_option
 def export(format, filename, projectpath, verbose):
     """Exports data as jsonl, json, bson or csv file"""
-    if verbose:
-        enable_verbose()
-    if projectpath:
-        acmd = ProjectBuilder(projectpath)
-    else:
-        acmd = ProjectBuilder(projectpath)
+    acmd = _builder(projectpath, verbose)
     acmd.export(format, filename)
     pass
 
 
-@click.group()
-def cli6():
-    pass
-
-
-@cli6.command()
-@click.option("--projectpath", "-p", default=None, help="Project path")
+@cli.command()
+@projectpath_option
 def info(projectpath):
     """Information about project like params and stats"""
-    if projectpath:
-        acmd = ProjectBuilder(projectpath)
-    else:
-        acmd = ProjectBuilder(projectpath)
+    acmd = _builder(projectpath)
     report = acmd.info(stats=True)
     pprint(report)
 
 
-@click.group()
-def cli7():
-    pass
-
-
-@cli7.command()
+@cli.command()
 @click.argument("mode")
-@click.option("--projectpath", "-p", default=None, help="Project path")
+@projectpath_option
 def follow(mode, projectpath):
     """Follow already extracted data to collect details. Use one of modes: full or continue"""
-    if projectpath:
-        acmd = ProjectBuilder(projectpath)
-    else:
-        acmd = ProjectBuilder(projectpath)
+    acmd = _builder(projectpath)
     acmd.follow(mode)
 
 
-@click.group()
-def cli8():
-    pass
-
-
-@cli8.command()
-@click.option("--projectpath", "-p", default=None, help="Project path")
+@cli.command()
+@projectpath_option
 def getfiles(projectpath):
     """Download files associated with records"""
-    if projectpath:
-        acmd = ProjectBuilder(projectpath)
-    else:
-        acmd = ProjectBuilder(projectpath)
+    acmd = _builder(projectpath)
     acmd.getfiles()
     pass
 
 
-@click.group()
-def cli9():
-    pass
-
-
-@cli9.command()
+@cli.command()
 @click.argument("filename", default=None)
-@click.option("--projectpath", "-p", default=None, help="Project path")
+@projectpath_option
 def package(filename, projectpath):
     """Create frictionless package"""
-    if projectpath:
-        acmd = ProjectBuilder(projectpath)
-    else:
-        acmd = ProjectBuilder(projectpath)
+    acmd = _builder(projectpath)
     acmd.to_package(filename)
 
-
-cli = click.CommandCollection(
-    sources=[cli2, cli3, cli4, cli5, cli6, cli7, cli8, cli9])
-
 # if __name__ == '__main__':
 #    cli()
@@ -1,18 +1,38 @@
-from zipfile import ZipFile, ZIP_DEFLATED
+from abc import ABC, abstractmethod
+from contextlib import suppress
+from zipfile import ZipFile, ZIP_DEFLATED, ZIP_STORED
 import os
+import shutil
+import tempfile
 
+from ..constants import (
+    ZIP_BUFFER_SIZE,
+    DEFAULT_COMPRESS_LEVEL,
+    STREAM_CHUNK_SIZE,
+    ZIP_STORED_MAX_SIZE
+)
 
-class FileStorage:
+# ZipFile mode to underlying file object mode, "a" resolved in ZipFileStorage
+ZIP_FILE_MODES = {"r": "rb", "w": "wb", "x": "xb"}
+
+
+class FileStorage(ABC):
     """Base file storage class"""
 
     def __init__(self):
         pass
 
+    @abstractmethod
     def exists(self, name):
-        raise NotImplementedError
+        """Returns True if file already stored"""
 
+    @abstractmethod
     def store(self, filename, content):
-        raise NotImplementedError
+        """Stores file content"""
+
+    def store_stream(self, filename, fileobj):
+        """Default implementation. Reads file object fully and stores it"""
+        self.store(filename, fileobj.read())
 
     def close(self):
         """Default implementation. Don't do anything"""
@@ -21,22 +41,61 @@ class FileStorage:
 
 class ZipFileStorage(FileStorage):
 
-    def __init__(self, filename, mode="a", compression=ZIP_DEFLATED):
+    def __init__(self,
+                 filename,
+                 mode="a",
+                 compression=ZIP_DEFLATED,
+                 compresslevel=DEFAULT_COMPRESS_LEVEL,
+                 fileobj=None):
         FileStorage.__init__(self)
-        self.mzip = ZipFile(filename, mode=mode, compression=compression)
-        self.allfiles = self.mzip.namelist()
-
-    def store(self, filename, content):
-        self.mzip.writestr(filename, content)
-        self.allfiles.append(filename)
+        # File object passed by caller, e.g. io.BytesIO, left open on close
+        self.fobj = None
+        if fileobj is None:
+            # Zip written through large buffer instead of many small writes
+            if mode == "a":
+                fmode = "r+b" if os.path.exists(filename) else "w+b"
+            else:
+                fmode = ZIP_FILE_MODES[mode]
+            fileobj = self.fobj = open(filename, fmode, buffering=ZIP_BUFFER_SIZE)
+        try:
+            self.mzip = ZipFile(fileobj,
+                                mode=mode,
+                                compression=compression,
+                                compresslevel=compresslevel)
+        except BaseException:
+            if self.fobj is not None:
+                self.fobj.close()
+            raise
+        self.allfiles = set(self.mzip.namelist())
+
+    def store(self, filename, content, compress_type=None):
+        # Tiny payloads don't shrink enough to be worth compressing
+        if compress_type is None and len(content) < ZIP_STORED_MAX_SIZE:
+            compress_type = ZIP_STORED
+        self.mzip.writestr(filename, content, compress_type=compress_type)
+        self.allfiles.add(filename)
+
+    def store_stream(self, filename, fileobj):
+        # Body spooled in full first, so failed read leaves no partial member
+        with tempfile.SpooledTemporaryFile(max_size=STREAM_CHUNK_SIZE) as spool:
+            shutil.copyfileobj(fileobj, spool, STREAM_CHUNK_SIZE)
+            size = spool.tell()
+            spool.seek(0)
+            if size < ZIP_STORED_MAX_SIZE:
+                # Tiny body goes through store() to be kept uncompressed
+                self.store(filename, spool.read())
+                return
+            with self.mzip.open(filename, "w", force_zip64=True) as dst:
+                shutil.copyfileobj(spool, dst, STREAM_CHUNK_SIZE)
+        self.allfiles.add(filename)
 
     def exists(self, filename):
-        if filename in self.allfiles:
-            return True
-        return False
+        return filename in self.allfiles
 
     def close(self):
         self.mzip.close()
+        if self.fobj is not None:
+            self.fobj.close()
 
 
 class FilesystemStorage(FileStorage):
@@ -44,16 +103,37 @@ class FilesystemStorage(FileStorage):
     def __init__(self, dirpath=os.path.join("storage", "files")):
         FileStorage.__init__(self)
         self.dirpath = dirpath
-        pass
+        self.dirs_created = set()
+
+    def _fullname(self, filename):
+        return os.path.join(self.dirpath, filename.lstrip('/').lstrip('\\'))
+
+    def _prepare(self, filename):
+        """Returns full file path, its directory created once per storage"""
+        fullname = self._fullname(filename)
+        dirname = os.path.dirname(fullname)
+        if dirname not in self.dirs_created:
+            os.makedirs(dirname, exist_ok=True)
+            self.dirs_created.add(dirname)
+        return fullname
 
     def exists(self, filename):
-        fullname = os.path.join(self.dirpath, filename.lstrip('/').lstrip('\\'))
-        return os.path.exists(fullname)
+        return os.path.exists(self._fullname(filename))
 
     def store(self, filename, content):
-        filename = filename.lstrip('/').lstrip('\\')
-        fullname = os.path.join(self.dirpath, filename)
-        os.makedirs(os.path.dirname(fullname), exist_ok=True)
-        fobj = open(fullname, "wb")
-        fobj.write(content)
-        fobj.close()
+        fullname = self._prepare(filename)
+        with open(fullname, "wb") as fobj:
+            fobj.write(content)
+
+    def store_stream(self, filename, fileobj):
+        fullname = self._prepare(filename)
+        # Written under temporary name, renamed only after full copy
+        partname = fullname + ".part"
+        try:
+            with open(partname, "wb") as dst:
+                shutil.copyfileobj(fileobj, dst, STREAM_CHUNK_SIZE)
+            os.replace(partname, fullname)
+        except BaseException:
+            with suppress(OSError):
+                os.remove(partname)
+            raise
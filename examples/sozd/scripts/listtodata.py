@@ -1,28 +1,39 @@
-from bs4 import BeautifulSoup
+import logging
+import lxml.etree
+import lxml.html
+
+HTML_PARSER = lxml.html.HTMLParser(encoding='utf8')
+XP_TOTAL = lxml.etree.XPath('//span[contains(concat(" ", @class, " "), " col_oz ")]')
+XP_ROWS = lxml.etree.XPath(
+    '//table[contains(concat(" ", @class, " "), " tbl_search_results ")]//tr')
+XP_LAW_NUMBER = lxml.etree.XPath(
+    '(.//div[contains(concat(" ", @class, " "), " o_top ")])[1]/@data-law_number')
+XP_CELLS = lxml.etree.XPath('.//td')
+XP_NAME = lxml.etree.XPath('.//div[contains(concat(" ", @class, " "), " fw500 ")]')
+XP_DIVS = lxml.etree.XPath('.//div')
+
+
 def process(html_doc):
-    soup = BeautifulSoup(html_doc, 'html.parser')
+    root = lxml.html.fromstring(html_doc, parser=HTML_PARSER)
     response = {}
 #    print(html_doc)
     response['data'] = []
-    try:
-        response['total'] = int(soup.find('span', attrs={'class' : "col_oz"}).string[1:-1]) 
-    except AttributeError:
+    total = XP_TOTAL(root)
+    if len(total) == 0 or total[0].text is None:
         response['total'] = 0
         return response
-    table = soup.find('table', attrs={'class' : 'tbl_search_results table table-hover mb0 table_input table_input_sk graggable_table'})
-    objects = table.findAll('tr')
-    for o in objects[1:]:
-        num_obj = o.find('div', attrs={'class' : "o_top"})        
-        if 'data-law_number' in num_obj.attrs.keys(): 
-            num = num_obj.attrs['data-law_number']
-            record = {'num' : num, 'url' : 'https://sozd.duma.gov.ru/bill/' + num }
-            cells = o.findAll('td')
-            record['name'] = cells[1].find('div', attrs={'class' : 'fw500'}).string
-            record['date_reg'] = cells[2].string
-            record['initiator'] = ' '.join([r.text.strip() for r in cells[3].findAll('div')])
-            record['date_lastaction'] = cells[5].string  
-            response['data'].append(record)
-        else:
+    response['total'] = int(total[0].text[1:-1])
+    for o in XP_ROWS(root)[1:]:
+        num = XP_LAW_NUMBER(o)
+        if len(num) == 0:
             continue
-    print(len(response['data']))
-    return response
\ No newline at end of file
+        num = str(num[0])
+        record = {'num' : num, 'url' : 'https://sozd.duma.gov.ru/bill/' + num }
+        cells = XP_CELLS(o)
+        record['name'] = XP_NAME(cells[1])[0].text
+        record['date_reg'] = cells[2].text
+        record['initiator'] = ' '.join([r.text_content().strip() for r in XP_DIVS(cells[3])])
+        record['date_lastaction'] = cells[5].text
+        response['data'].append(record)
+    logging.debug('List page records: %d', len(response['data']))
+    return response
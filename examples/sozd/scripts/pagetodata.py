@@ -1,7 +1,30 @@
 # from bs4 import BeautifulSoup
+import logging
+import re
 import lxml.etree
 import lxml.html
 
+HTML_PARSER = lxml.html.HTMLParser(encoding='utf8')
+WS_RE = re.compile(r'\s+')
+XP_TBODY_ROWS = lxml.etree.XPath('./tbody/tr')
+XP_ROWS = lxml.etree.XPath('./tr')
+XP_CELLS = lxml.etree.XPath('(./td|./th)')
+XP_TABLES = lxml.etree.XPath('./table')
+# Text nodes kept separate, text_content() would glue words split by <br>
+XP_TEXTS = lxml.etree.XPath('.//text()', smart_strings=False)
+XP_ALL_TABLES = lxml.etree.XPath('//table')
+XP_STATUS = lxml.etree.XPath('//span[@id="current_oz_status"]')
+XP_LAW_NUM = lxml.etree.XPath(
+    '//span[@data-original-title="Номер федерального закона"]')
+XP_LAW_URL = lxml.etree.XPath(
+    '//span[@data-original-title="Номер опубликования"]/a')
+XP_NUM = lxml.etree.XPath('//span[@id="number_oz_id"]')
+XP_NAME = lxml.etree.XPath('//span[@id="oz_name"]')
+XP_DOCS = lxml.etree.XPath("//div[@class='table_icona']")
+XP_DOC_FORMAT = lxml.etree.XPath('div[@class="table_iconatd1"]/span/@class', smart_strings=False)
+XP_DOC_NAME = lxml.etree.XPath('div/div[@class="doc_wrap"]')
+
+
 def taglist_to_dict(tags, fields, strip_lf=True):
     """Converts list of tags into dict"""
     has_text = TEXT_FIELD in fields
@@ -17,9 +40,9 @@ def taglist_to_dict(tags, fields, strip_lf=True):
         if has_text:
             item[TEXT_FIELD] = ' '.join(t.itertext()).strip()
             if strip_lf:
-                item[TEXT_FIELD] = (' '.join(item[TEXT_FIELD].split())).strip()
+                item[TEXT_FIELD] = WS_RE.sub(' ', item[TEXT_FIELD]).strip()
         for f in finfields:
-            item[f] = t.attrib[f].strip() if f in t.attrib.keys() else ""
+            item[f] = t.attrib[f].strip() if f in t.attrib else ""
         data.append(item)
     return data
 
@@ -27,17 +50,17 @@ def taglist_to_dict(tags, fields, strip_lf=True):
 def table_to_dict(node, strip_lf=True):
     """Extracts data from table"""
     data = []
-    rows = node.xpath('./tbody/tr')
+    rows = XP_TBODY_ROWS(node)
     if len(rows) == 0:
-        rows = node.xpath('./tr')
+        rows = XP_ROWS(node)
     for row in rows:
         cells = []
-        for cell in row.xpath('(./td|./th)'):
-            inner_tables = cell.xpath('./table')
+        for cell in XP_CELLS(row):
+            inner_tables = XP_TABLES(cell)
             if len(inner_tables) < 1:
-                text = ' '.join(cell.itertext()) #cell.text_content()
+                text = ' '.join(XP_TEXTS(cell))
                 if strip_lf:
-                    text = text.replace('\r',u' ').replace('\n', u' ').strip()
+                    text = WS_RE.sub(' ', text).strip()
                 cells.append(text)
             else:
                 cells.append([table_to_dict(node, strip_lf) for t in inner_tables])
@@ -58,49 +81,49 @@ KEYMAP = {'Субъект права законодательной инициа
           'Принадлежность к примерной программе' : 'lawmaking_program',
           'Пакет документов при внесении' : None}  
 
+# Marks row names missing in KEYMAP, as None there means skipped row
+UNKNOWN_KEY = object()
+
 
 def process(html_doc):
-    hp = lxml.etree.HTMLParser(encoding='utf8')
-    root = lxml.html.fromstring(html_doc, parser=hp)
-    pasp_table = root.xpath('//table')[0]  
+    root = lxml.html.fromstring(html_doc, parser=HTML_PARSER)
+    pasp_table = XP_ALL_TABLES(root)[0]  
     table = table_to_dict(pasp_table)
     response = {}
     for row in table:
-        if row[0] in KEYMAP.keys():
-            if KEYMAP[row[0]] is not None:
-                response[KEYMAP[row[0]]] = row[1]
-        else:
-           print(row[0])
-    status = root.xpath('//span[@id="current_oz_status"]')
+        key = KEYMAP.get(row[0], UNKNOWN_KEY)
+        if key is UNKNOWN_KEY:
+            logging.debug('Unmapped row key: %s', row[0])
+        elif key is not None:
+            response[key] = row[1]
+    status = XP_STATUS(root)
     if len(status) > 0:
         status = status[0].text.strip()
     else:
         status = ""
-        law_num = root.xpath('//span[@data-original-title="Номер федерального закона"]')
+        law_num = XP_LAW_NUM(root)
         if len(law_num) > 0:
             response['law_num'] = law_num[0].text.strip()
             status = "Закон опубликован"
-        law_url = root.xpath('//span[@data-original-title="Номер опубликования"]/a')
+        law_url = XP_LAW_URL(root)
         if len(law_url) > 0:
             response['law_url'] = law_url[0].attrib['href']
             response['law_identifier'] = law_url[0].text.strip()
     response['status'] = status
-    response['num'] = root.xpath('//span[@id="number_oz_id"]')[0].text.split()[-1]
-    response['name'] = root.xpath('//span[@id="oz_name"]')[0].text.strip()
+    response['num'] = XP_NUM(root)[0].text.split()[-1]
+    response['name'] = XP_NAME(root)[0].text.strip()
     response['documents'] = []
-    doc_tags = root.xpath("//div[@class='table_icona']")    
+    doc_tags = XP_DOCS(root)    
 #    print(doc_tags)
     for doc in doc_tags:
-        url = doc.getparent().attrib['href']
-        try:
-            doc_date = doc.getparent().attrib['title'].split(' ', 1)[0]
-        except:
-            doc_date = ''
-        format_t = doc.xpath('div[@class="table_iconatd1"]/span')
+        parent = doc.getparent()
+        url = parent.attrib['href']
+        doc_date = parent.get('title', '').split(' ', 1)[0]
+        format_t = XP_DOC_FORMAT(doc)
         doc_format = ''
         if len(format_t) > 0:
-          doc_format = format_t[0].attrib['class'].split()[0].split('-')[-1]
-        name_t = doc.xpath('div/div[@class="doc_wrap"]')
+            doc_format = format_t[0].split()[0].split('-')[-1]
+        name_t = XP_DOC_NAME(doc)
         name = ""
         if len(name_t) > 0:
             name = name_t[0].text.strip()
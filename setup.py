@@ -8,10 +8,20 @@ import re
 from setuptools import setup, find_packages
 from setuptools.command.test import test as TestCommand
 
-import apibackuper
-
 open_as_utf = lambda x: io.open(x, encoding='utf-8')
 
+
+def read_metadata(filename):
+    """Reads docstring and __dunder__ values without importing the package"""
+    with open_as_utf(filename) as f:
+        text = f.read()
+    metadata = dict(re.findall(r'^__(\w+)__ = [\'"]([^\'"]*)[\'"]', text, re.M))
+    metadata['doc'] = re.match(r'\s*"""(.*?)"""', text, re.S).group(1)
+    return metadata
+
+
+metadata = read_metadata('apibackuper/__init__.py')
+
 class PyTest(TestCommand):
     # `$ python setup.py test' simply installs minimal requirements
     # and runs the tests with no fancy stuff like parallel execution.
@@ -37,7 +47,7 @@ tests_require = [
 
 
 install_requires = [
-    'pymongo', 'click', 'lxml', 'urllib3', 'requests', 'xmltodict'
+    'click', 'lxml', 'urllib3', 'requests', 'xmltodict'
 ]
 
 
@@ -56,6 +66,7 @@ if 'bdist_wheel' not in sys.argv:
 extras_require = {
     # https://wheel.readthedocs.io/en/latest/#defining-conditional-dependencies
 #    'python_version == "3.0" or python_version == "3.1"': ['argparse>=1.2.1'],
+    'orjson': ['orjson'],
 }
 
 
@@ -67,17 +78,17 @@ def long_description():
 
 setup(
     name='apibackuper',
-    version=apibackuper.__version__,
-    description=apibackuper.__doc__.strip(),
+    version=metadata['version'],
+    description=metadata['doc'].strip(),
     long_description=long_description(),
     long_description_content_type='text/markdown',
     url='https://github.com/datacoon/apibackuper/',
     download_url='https://github.com/datacoon/apibackuper/',
     packages=find_packages(exclude=('tests', 'tests.*')),
     include_package_data=True,
-    author=apibackuper.__author__,
+    author=metadata['author'],
     author_email='ivan@begtin.tech',
-    license=apibackuper.__licence__,
+    license=metadata['licence'],
     entry_points={
         'console_scripts': [
             'apibackuper = apibackuper.__main__:main',